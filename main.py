@@ -2,6 +2,8 @@ import argparse
 import sys
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import List, Optional, Dict
 from pathlib import Path
 from src.core.app import DanceShortsAutomator
@@ -103,33 +105,46 @@ def _discover_project_folders(input_path: Path) -> List[Path]:
     Create default veo_instructions.json if missing but metadata exists.
     """
     project_folders = []
-    for item in input_path.iterdir():
-        if item.is_dir():
-            # Check if folder has at least metadata_options.json
-            # veo_instructions.json will be created with defaults if missing
-            # style_options.json will fall back to master copy if not present
-            metadata_file = item / 'metadata_options.json'
-            veo_file = item / 'veo_instructions.json'
-            
-            if metadata_file.exists():
-                # Create default veo_instructions.json if it doesn't exist
-                if not veo_file.exists():
-                    create_default_veo_instructions(item)
-                
-                project_folders.append(item)
-            else:
-                logging.warning(f"Skipping {item.name}: missing required metadata_options.json")
+    # scandir reports the entry type from the directory listing, without a stat per entry.
+    # Hidden folders (.git, ...) and __pycache__ are never projects, so skip them unprobed.
+    with os.scandir(input_path) as entries:
+        subdirs = [
+            Path(entry.path) for entry in entries
+            if not entry.name.startswith('.') and entry.name != '__pycache__' and entry.is_dir()
+        ]
+
+    for item in subdirs:
+        # Check if folder has at least metadata_options.json
+        # veo_instructions.json will be created with defaults if missing
+        # style_options.json will fall back to master copy if not present
+        metadata_file = item / 'metadata_options.json'
+        veo_file = item / 'veo_instructions.json'
+
+        if metadata_file.exists():
+            # Create default veo_instructions.json if it doesn't exist
+            if not veo_file.exists():
+                create_default_veo_instructions(item)
+
+            project_folders.append(item)
+        else:
+            logging.warning(f"Skipping {item.name}: missing required metadata_options.json")
     return project_folders
 
-def _resolve_style_path(project_folder: Path, input_path: Path) -> Optional[Path]:
+def _find_master_style(input_path: Path) -> Optional[Path]:
+    """
+    Looks up the master style_options.json in the project root once per batch.
+    """
+    master_style_path = input_path.parent / 'style_options.json'
+    return master_style_path if master_style_path.exists() else None
+
+def _resolve_style_path(project_folder: Path, master_style_path: Optional[Path]) -> Optional[Path]:
     """
     Determines the path to style_options.json, falling back to master copy if needed.
     """
     style_file_path = project_folder / 'style_options.json'
     if not style_file_path.exists():
         # Fallback to master copy in project root
-        master_style_path = input_path.parent / 'style_options.json'
-        if master_style_path.exists():
+        if master_style_path:
             logging.info(f"  Using master style_options.json (no local copy found)")
             return master_style_path
         else:
@@ -139,7 +154,66 @@ def _resolve_style_path(project_folder: Path, input_path: Path) -> Optional[Path
         logging.info(f"  Using local style_options.json")
         return style_file_path
 
-def _process_single_project(project_folder: Path, input_path: Path, output_path: Path, dry_run: bool) -> bool:
+def _snapshot_inputs(app: DanceShortsAutomator) -> Dict[str, Optional[List[int]]]:
+    """
+    Records (st_mtime_ns, st_size) for every file a loaded project's render reads.
+    Files that do not exist are recorded as None, so adding them later invalidates the render.
+    """
+    snapshot = {}
+    for path in app.referenced_files():
+        try:
+            stat = os.stat(path)
+            snapshot[path] = [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            snapshot[path] = None
+    return snapshot
+
+def _manifest_path(output_file: Path) -> Path:
+    """
+    Returns the path of the input manifest stored next to a rendered output.
+    """
+    return output_file.with_suffix('.inputs.json')
+
+def _write_manifest(output_file: Path, inputs: Dict[str, Optional[List[int]]], burn_in_captions: bool) -> None:
+    """
+    Stores the inputs a successful render used, its caption mode and the resulting output's stat.
+    """
+    import json
+
+    stat = output_file.stat()
+    manifest = {
+        'burn_in_captions': burn_in_captions,
+        'output': [stat.st_mtime_ns, stat.st_size],
+        'inputs': inputs,
+    }
+    with open(_manifest_path(output_file), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def _is_up_to_date(output_file: Path, inputs: Dict[str, Optional[List[int]]], burn_in_captions: bool) -> bool:
+    """
+    Checks whether a previous render can be reused.
+
+    The manifest written next to the output must list exactly the same input
+    files with the same existence, mtime and size, the same caption mode, and
+    the output itself must be unchanged since it was recorded.
+    """
+    import json
+
+    try:
+        with open(_manifest_path(output_file)) as f:
+            manifest = json.load(f)
+        stat = output_file.stat()
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+
+    return (
+        manifest.get('burn_in_captions') == burn_in_captions
+        and manifest.get('output') == [stat.st_mtime_ns, stat.st_size]
+        and manifest.get('inputs') == inputs
+    )
+
+def _process_single_project(project_folder: Path, master_style_path: Optional[Path], output_path: Path, dry_run: bool,
+                            burn_in_captions: bool = True, incremental: bool = False) -> bool:
     """
     Processes a single project folder. Returns True if successful.
     """
@@ -147,7 +221,7 @@ def _process_single_project(project_folder: Path, input_path: Path, output_path:
 
     try:
         # Determine style file path (use local or fallback to master)
-        style_file_path = _resolve_style_path(project_folder, input_path)
+        style_file_path = _resolve_style_path(project_folder, master_style_path)
         if not style_file_path:
             return False
 
@@ -163,7 +237,18 @@ def _process_single_project(project_folder: Path, input_path: Path, output_path:
         # Set output path
         output_file = output_path / f"{project_name}_final.mp4"
 
-        app.process_pipeline(dry_run=dry_run, output_path=str(output_file))
+        track_inputs = incremental and not dry_run
+        if track_inputs:
+            # Snapshot before rendering: an input edited mid-render makes the next run stale
+            inputs = _snapshot_inputs(app)
+            if _is_up_to_date(output_file, inputs, burn_in_captions):
+                logging.info(f"✓ Up to date, skipped: {project_name}")
+                return True
+
+        app.process_pipeline(dry_run=dry_run, output_path=str(output_file), burn_in_captions=burn_in_captions)
+
+        if track_inputs:
+            _write_manifest(output_file, inputs, burn_in_captions)
 
         logging.info(f"✓ Successfully processed: {project_name}")
         return True
@@ -196,7 +281,8 @@ def _print_batch_summary(results: Dict[str, List[str]], total_projects: int, out
     logging.info(f"\nOutput directory: {output_dir}")
     logging.info(f"{'='*60}\n")
 
-def process_batch(input_dir: str, output_dir: str, dry_run: bool = False):
+def process_batch(input_dir: str, output_dir: str, dry_run: bool = False, jobs: int = 1,
+                  burn_in_captions: bool = True, incremental: bool = False):
     """
     Process multiple video projects from input directory.
 
@@ -204,6 +290,9 @@ def process_batch(input_dir: str, output_dir: str, dry_run: bool = False):
         input_dir: Directory containing project subfolders
         output_dir: Directory to write output videos
         dry_run: If True, simulate processing without rendering
+        jobs: Number of projects to render in parallel worker processes
+        burn_in_captions: If False, write captions as .srt sidecars and soft subtitle tracks
+        incremental: If True, skip projects whose inputs and caption mode match the manifest of their last render
     """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
@@ -229,16 +318,28 @@ def process_batch(input_dir: str, output_dir: str, dry_run: bool = False):
     logging.info(f"{'='*60}\n")
     
     results = {'succeeded': [], 'failed': []}
-    
-    for idx, project_folder in enumerate(project_folders, 1):
-        project_name = project_folder.name
-        logging.info(f"\n[{idx}/{len(project_folders)}] Processing: {project_name}")
-        logging.info("-" * 60)
-        
-        if _process_single_project(project_folder, input_path, output_path, dry_run):
-            results['succeeded'].append(project_name)
-        else:
-            results['failed'].append(project_name)
+    master_style_path = _find_master_style(input_path)
+
+    if jobs > 1:
+        # Projects are independent, so render them in separate processes
+        logging.info(f"Rendering with {jobs} parallel workers")
+        with ProcessPoolExecutor(max_workers=jobs, initializer=setup_logging) as executor:
+            outcomes = list(executor.map(
+                _process_single_project, project_folders,
+                repeat(master_style_path), repeat(output_path), repeat(dry_run),
+                repeat(burn_in_captions), repeat(incremental)
+            ))
+    else:
+        outcomes = []
+        for idx, project_folder in enumerate(project_folders, 1):
+            logging.info(f"\n[{idx}/{len(project_folders)}] Processing: {project_folder.name}")
+            logging.info("-" * 60)
+            outcomes.append(_process_single_project(
+                project_folder, master_style_path, output_path, dry_run, burn_in_captions, incremental
+            ))
+
+    for project_folder, succeeded in zip(project_folders, outcomes):
+        results['succeeded' if succeeded else 'failed'].append(project_folder.name)
     
     _print_batch_summary(results, len(project_folders), output_dir)
     
@@ -261,6 +362,15 @@ Examples:
   
   # Batch processing with custom directories
   python main.py --batch --input-dir my_videos --output-dir renders
+
+  # Render four batch projects at a time
+  python main.py --batch --jobs 4
+
+  # Re-render only projects whose inputs changed since the last batch
+  python main.py --batch --incremental
+
+  # Keep captions as a subtitle track (.srt sidecar) instead of drawing them
+  python main.py --no-burn-in
         """
     )
     parser.add_argument('--version', action='version', version='%(prog)s 1.0.0')
@@ -268,6 +378,9 @@ Examples:
     parser.add_argument('--batch', action='store_true', help="Enable batch processing mode to process multiple video projects.")
     parser.add_argument('--input-dir', default='inputs', help="Input directory containing project folders (default: inputs/).")
     parser.add_argument('--output-dir', default='outputs', help="Output directory for rendered videos (default: outputs/).")
+    parser.add_argument('--jobs', type=int, default=1, help="Number of batch projects to render in parallel (default: 1).")
+    parser.add_argument('--incremental', action='store_true', help="In batch mode, skip projects whose inputs are unchanged since their last render.")
+    parser.add_argument('--no-burn-in', action='store_true', help="Write captions as an .srt sidecar and soft subtitle track instead of drawing them into the video.")
     
     args = parser.parse_args()
     
@@ -275,7 +388,10 @@ Examples:
     
     # Batch processing mode
     if args.batch:
-        process_batch(args.input_dir, args.output_dir, args.dry_run)
+        process_batch(
+            args.input_dir, args.output_dir, args.dry_run, max(1, args.jobs),
+            burn_in_captions=not args.no_burn_in, incremental=args.incremental
+        )
         return
     
     # Single video mode (original behavior)
@@ -289,7 +405,7 @@ Examples:
         )
         
         app.load_configurations()
-        app.process_pipeline(dry_run=args.dry_run)
+        app.process_pipeline(dry_run=args.dry_run, burn_in_captions=not args.no_burn_in)
         
     except Exception as e:
         logging.error(f"Application failed: {e}")
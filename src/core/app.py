@@ -1,12 +1,90 @@
 import json
 import os
 import logging
-from typing import Dict, Any, List
-from moviepy import VideoFileClip, TextClip, CompositeVideoClip, concatenate_videoclips
-import moviepy.video.fx as vfx
+import functools
+import shutil
+import tempfile
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from src.core.stitcher import SceneStitcher, nvenc_available, TARGET_WIDTH
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; stdlib json is used without it
+    orjson = None
+
+if TYPE_CHECKING:
+    # numpy and Pillow are only needed once captions are rendered
+    import numpy as np
+    from PIL import ImageFont
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_FPS = 24
+CROSSFADE_DURATION = 0.5
+
+# Top edge of the caption block in the 720x1280 frame
+CAPTION_Y = 800
+
+# Shorts delivery: moov atom up front, 4:2:0 chroma, and a fixed 1s keyframe interval
+SHORTS_FFMPEG_PARAMS = [
+    '-movflags', '+faststart',
+    '-pix_fmt', 'yuv420p',
+    '-g', str(OUTPUT_FPS),
+    '-keyint_min', str(OUTPUT_FPS),
+    '-sc_threshold', '0',
+]
+
+# Rate control for the h264_nvenc path (libx264 keeps MoviePy's defaults)
+NVENC_FFMPEG_PARAMS = ['-rc', 'vbr', '-b:v', '6M', '-maxrate', '8M']
+
+@functools.lru_cache(maxsize=16)
+def _get_font(font: str, font_size: int) -> Optional['ImageFont.FreeTypeFont']:
+    """
+    Loads a TrueType font once per (font, size) pair.
+
+    Returns:
+        The loaded font, or None if Pillow cannot resolve it
+    """
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(font, font_size)
+    except OSError:
+        return None
+
+def _split_long_word(word: str, pil_font: 'ImageFont.FreeTypeFont', max_width: int) -> List[str]:
+    """
+    Breaks a word wider than max_width into pieces that each fit, so it is wrapped instead of clipped.
+    """
+    pieces = []
+    while len(word) > 1 and pil_font.getlength(word) > max_width:
+        cut = 1
+        while cut < len(word) - 1 and pil_font.getlength(word[:cut + 1]) <= max_width:
+            cut += 1
+        pieces.append(word[:cut])
+        word = word[cut:]
+    pieces.append(word)
+    return pieces
+
+def _load_json(path: str) -> Any:
+    """
+    Parses a JSON file, using orjson's faster decoder when it is installed.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON (orjson's error subclasses it)
+    """
+    # Open directly rather than checking os.path.exists first: one syscall on the happy path
+    try:
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                return orjson.loads(f.read())
+
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{path} not found.") from None
+
 class DanceShortsAutomator:
     """
     Core logic for the video editing pipeline.
@@ -34,46 +112,95 @@ class DanceShortsAutomator:
         self.style_options: Dict[str, Any] = {}
         self.selected_style: Dict[str, Any] = {}
         self.selected_metadata: Dict[str, Any] = {}
+        self.scene_start_times: List[float] = []
+        self.timeline_duration = 0.0
+        self._caption_cache: Dict[tuple, 'np.ndarray'] = {}
+        self.use_gpu = os.environ.get('DS_USE_NVENC', '').lower() in ('1', 'true', 'yes')
 
     def load_configurations(self) -> None:
         """
         Loads and validates JSON configuration files.
         """
-        if not os.path.exists(self.instruction_file):
-            raise FileNotFoundError(f"{self.instruction_file} not found.")
-        
-        if not os.path.exists(self.options_file):
-            raise FileNotFoundError(f"{self.options_file} not found.")
-        
-        if not os.path.exists(self.style_file):
-            raise FileNotFoundError(f"{self.style_file} not found.")
+        loaded_data = _load_json(self.instruction_file)
+
+        # Normalize old format (array) to new format (object with scenes key)
+        if isinstance(loaded_data, list):
+            logger.info(f"Detected legacy array format in {self.instruction_file}, normalizing...")
+            self.instructions = {
+                "scenes": loaded_data,
+                "audio_source": None
+            }
+        else:
+            self.instructions = loaded_data
 
-        with open(self.instruction_file, 'r') as f:
-            loaded_data = json.load(f)
-            
-            # Normalize old format (array) to new format (object with scenes key)
-            if isinstance(loaded_data, list):
-                logger.info(f"Detected legacy array format in {self.instruction_file}, normalizing...")
-                self.instructions = {
-                    "scenes": loaded_data,
-                    "audio_source": None
-                }
-            else:
-                self.instructions = loaded_data
-            
-            logger.info(f"Loaded instructions from {self.instruction_file}")
+        logger.info(f"Loaded instructions from {self.instruction_file}")
 
-        with open(self.options_file, 'r') as f:
-            self.metadata_options = json.load(f)
-            logger.info(f"Loaded metadata options from {self.options_file}")
-        
-        with open(self.style_file, 'r') as f:
-            self.style_options = json.load(f)
-            logger.info(f"Loaded style options from {self.style_file}")
+        self.metadata_options = _load_json(self.options_file)
+        logger.info(f"Loaded metadata options from {self.options_file}")
 
+        self.style_options = _load_json(self.style_file)
+        logger.info(f"Loaded style options from {self.style_file}")
+
+        self._validate_scenes()
         self._apply_metadata_selection()
         self._apply_style_logic()
         self._validate_audio_source()
+        self._compute_timeline()
+
+    def _validate_scenes(self) -> None:
+        """
+        Validates the structure of every scene in a single pass.
+
+        Runs once at load time so malformed instructions are reported before
+        any clip is decoded (and during dry runs).
+
+        Raises:
+            ValueError: If a scene is not in video stitching format
+        """
+        for index, scene in enumerate(self.instructions.get('scenes', [])):
+            if not isinstance(scene, dict):
+                raise ValueError(f"Scene {index+1} must be an object, got {type(scene).__name__}.")
+
+            if scene.get('source') is None:
+                # Check if this is a Veo generation format (has start_image/end_image/prompt)
+                if 'start_image' in scene or 'end_image' in scene or 'prompt' in scene:
+                    raise ValueError(
+                        f"Scene {index+1} appears to be in Veo AI generation format (contains 'start_image'/'end_image'/'prompt'). "
+                        "This tool requires video stitching format with 'source', 'start', and 'duration' fields. "
+                        "Please convert your Veo generation instructions to actual video clips first."
+                    )
+                raise ValueError(
+                    f"Scene {index+1} is missing required 'source' field. "
+                    "Expected format: {\"source\": \"clip.mp4\", \"start\": 0, \"duration\": 5}"
+                )
+
+            for field in ('start', 'duration'):
+                value = scene.get(field)
+                if value is None:
+                    continue
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"Scene {index+1} has non-numeric '{field}': {value!r}")
+                if value < 0 or (field == 'duration' and value == 0):
+                    raise ValueError(f"Scene {index+1} has out-of-range '{field}': {value!r}")
+
+    def _compute_timeline(self) -> None:
+        """
+        Computes each scene's start time on the stitched timeline from the instructions alone.
+
+        Every transition overlaps two scenes by CROSSFADE_DURATION, so scene i
+        starts at the sum of the previous durations minus one crossfade each.
+        Start times are listed by scene position; 'id' is only a label.
+        """
+        self.scene_start_times = []
+        current_time = 0.0
+        scenes = self.instructions.get('scenes', [])
+
+        for scene in scenes:
+            self.scene_start_times.append(current_time)
+            current_time += scene.get('duration', 5) - CROSSFADE_DURATION
+
+        # The last scene plays out in full
+        self.timeline_duration = current_time + CROSSFADE_DURATION if scenes else 0.0
 
     def _apply_metadata_selection(self) -> None:
         """
@@ -103,6 +230,29 @@ class DanceShortsAutomator:
             logger.warning(f"Default style {default_style} not found. Falling back to first available option.")
             self.selected_style = next(iter(options_data.values())) if options_data else {}
 
+    def _resolve_path(self, path: str) -> str:
+        """
+        Resolves a path from the instructions against the working directory (absolute paths pass through).
+        """
+        return path if os.path.isabs(path) else os.path.join(self.working_directory, path)
+
+    def referenced_files(self) -> List[str]:
+        """
+        Lists every input file a render reads: the configuration files, each
+        scene's source and the custom audio track. Requires load_configurations().
+
+        Returns:
+            Resolved paths (files may not exist; missing sources are skipped at render time)
+        """
+        files = [self.instruction_file, self.options_file, self.style_file]
+        files += [self._resolve_path(scene['source']) for scene in self.instructions.get('scenes', [])]
+
+        audio_source = self.instructions.get('audio_source')
+        if audio_source:
+            files.append(self._resolve_path(audio_source))
+
+        return files
+
     def _validate_audio_source(self) -> None:
         """
         Validates that the custom audio source file exists if specified.
@@ -110,55 +260,47 @@ class DanceShortsAutomator:
         audio_source = self.instructions.get('audio_source')
         if audio_source:
             # Resolve relative paths from working directory
-            audio_path = os.path.join(self.working_directory, audio_source) if not os.path.isabs(audio_source) else audio_source
+            audio_path = self._resolve_path(audio_source)
             if not os.path.exists(audio_path):
                 raise FileNotFoundError(f"Audio source file not found: {audio_path}")
             logger.info(f"Custom audio source specified: {audio_path}")
 
-    def _apply_custom_audio(self, video_clip: VideoFileClip) -> VideoFileClip:
+    def _resolve_custom_audio(self, video_duration: float) -> Optional[str]:
         """
-        Replaces the video's audio with a custom audio file if specified.
-        
+        Resolves the custom audio file that replaces the scenes' audio, if specified.
+
+        The render trims the track to the video; a shorter track only triggers a warning.
+
         Args:
-            video_clip: The video clip to apply custom audio to
-            
+            video_duration: Total duration of the stitched video in seconds
+
         Returns:
-            Video clip with replaced audio, or original clip if no custom audio
+            Resolved audio path, or None if no custom audio is specified
         """
         audio_source = self.instructions.get('audio_source')
-        
+
         if not audio_source:
-            return video_clip
-        
-        try:
-            from moviepy import AudioFileClip
-            # Resolve relative paths from working directory
-            audio_path = os.path.join(self.working_directory, audio_source) if not os.path.isabs(audio_source) else audio_source
-            logger.info(f"Loading custom audio from: {audio_path}")
-            audio_clip = AudioFileClip(audio_path)
-            
-            # Match audio duration to video duration
-            if audio_clip.duration > video_clip.duration:
-                # Trim audio to match video length
-                audio_clip = audio_clip.subclipped(0, video_clip.duration)
-                logger.info(f"Audio trimmed to match video duration: {video_clip.duration:.2f}s")
-            elif audio_clip.duration < video_clip.duration:
-                # Loop audio to match video length if needed
-                logger.warning(f"Audio duration ({audio_clip.duration:.2f}s) is shorter than video ({video_clip.duration:.2f}s). Consider using a longer audio file.")
-            
-            # Replace the audio
-            video_clip = video_clip.with_audio(audio_clip)
-            logger.info("Custom audio applied successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to apply custom audio: {e}")
-            raise
-        
-        return video_clip
+            return None
+
+        from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+        # Resolve relative paths from working directory
+        audio_path = self._resolve_path(audio_source)
+        logger.info(f"Loading custom audio from: {audio_path}")
+        audio_duration = ffmpeg_parse_infos(audio_path)['duration']
+
+        if audio_duration > video_duration:
+            logger.info(f"Audio trimmed to match video duration: {video_duration:.2f}s")
+        elif audio_duration < video_duration:
+            logger.warning(f"Audio duration ({audio_duration:.2f}s) is shorter than video ({video_duration:.2f}s). Consider using a longer audio file.")
+
+        return audio_path
 
     def _validate_scene_clip(self, scene: Dict[str, Any], index: int) -> str:
         """
-        Validates scene fields and source file existence.
+        Resolves a scene's source path and checks that the file exists.
+
+        Scene structure is already validated by _validate_scenes().
 
         Args:
             scene: Scene dictionary
@@ -166,29 +308,11 @@ class DanceShortsAutomator:
 
         Returns:
             Resolved source path if valid, None if file missing
-            
-        Raises:
-            ValueError: If scene format is invalid
         """
-        source = scene.get('source')
-
-        # Validate that required fields exist
-        if source is None:
-            # Check if this is a Veo generation format (has start_image/end_image/prompt)
-            if 'start_image' in scene or 'end_image' in scene or 'prompt' in scene:
-                raise ValueError(
-                    f"Scene {index+1} appears to be in Veo AI generation format (contains 'start_image'/'end_image'/'prompt'). "
-                    "This tool requires video stitching format with 'source', 'start', and 'duration' fields. "
-                    "Please convert your Veo generation instructions to actual video clips first."
-                )
-            else:
-                raise ValueError(
-                    f"Scene {index+1} is missing required 'source' field. "
-                    "Expected format: {{\"source\": \"clip.mp4\", \"start\": 0, \"duration\": 5}}"
-                )
+        source = scene['source']
 
         # Resolve relative paths from working directory
-        source_path = os.path.join(self.working_directory, source) if not os.path.isabs(source) else source
+        source_path = self._resolve_path(source)
 
         if not os.path.exists(source_path):
             logger.warning(f"Source file {source_path} not found. Skipping.")
@@ -196,58 +320,26 @@ class DanceShortsAutomator:
             
         return source_path
 
-    def _process_scene_clip(self, source_path: str, scene: Dict[str, Any], index: int) -> VideoFileClip:
+    def _plan_segments(self, stitcher: SceneStitcher) -> List[Dict[str, Any]]:
         """
-        Loads, trims, resizes, crops, and applies transitions to a clip.
-        """
-        start = scene.get('start', 0)
-        duration = scene.get('duration', 5)
-
-        clip = VideoFileClip(source_path).subclipped(start, start + duration)
-
-        # Ensure 9:16 aspect ratio (720x1280) via Crop-to-Fill
-        target_w, target_h = 720, 1280
-        target_ratio = target_w / target_h
-        current_ratio = clip.w / clip.h
-
-        if current_ratio > target_ratio:
-            # Source is wider than target (e.g. 16:9 vs 9:16)
-            # Resize by height to match target height, then crop width
-            clip = clip.resized(height=target_h)
-            clip = clip.cropped(width=target_w, height=target_h, x_center=clip.w / 2, y_center=clip.h / 2)
-        else:
-            # Source is taller or equal (e.g. 9:16 or thinner)
-            # Resize by width to match target width, then crop height
-            clip = clip.resized(width=target_w)
-            clip = clip.cropped(width=target_w, height=target_h, x_center=clip.w / 2, y_center=clip.h / 2)
-
-        # Apply CrossFadeIn to subsequent clips for transition effect
-        if index > 0:
-            clip = clip.with_effects([vfx.CrossFadeIn(0.5)])
+        Resolves and probes every scene with an existing source file.
 
-        return clip
+        Args:
+            stitcher: Stitcher that probes the sources and later renders the segments
 
-    def _stitch_scenes(self) -> VideoFileClip:
-        """
-        Stitches scenes together with cross-dissolve transitions.
+        Returns:
+            Planned segments in scene order (missing sources are skipped)
         """
-        scenes_data = self.instructions.get('scenes', [])
-        clips = []
+        segments = []
 
-        for i, scene in enumerate(scenes_data):
+        for i, scene in enumerate(self.instructions.get('scenes', [])):
             source_path = self._validate_scene_clip(scene, i)
             if not source_path:
                 continue
 
-            clip = self._process_scene_clip(source_path, scene, i)
-            clips.append(clip)
-
-        if not clips:
-            raise ValueError("No valid clips found to stitch.")
+            segments.append(stitcher.plan_segment(source_path, scene, i))
 
-        # method='compose' and padding required for overlapping transitions
-        final_clip = concatenate_videoclips(clips, method="compose", padding=-0.5)
-        return final_clip
+        return segments
 
     def _extract_overlays_from_metadata(self, video_duration: float) -> List[Dict[str, Any]]:
         """
@@ -284,61 +376,140 @@ class DanceShortsAutomator:
         
         return overlays
     
-    def _apply_overlays(self, base_clip: VideoFileClip) -> CompositeVideoClip:
+    def _render_caption(self, text: str, font: str, color: str, font_size: int, max_width: int) -> 'np.ndarray':
+        """
+        Rasterizes a caption to an RGBA array once with Pillow.
+
+        Explicit newlines are kept; words are wrapped to max_width within each
+        line (a single word wider than that is broken) and every line is centered. Line height comes from the font's
+        ascent + descent, so descenders (g, y, p, q, j) are never cropped. Results are cached per (text, font, color, size, width),
+        so repeated captions are a dict hit.
+
+        Args:
+            text: Caption text
+            font: Font name or path; Pillow's default font is used if it cannot be loaded
+            color: Any Pillow color string (e.g. 'white', '#FFD700')
+            font_size: Font size in pixels
+            max_width: Wrap width in pixels
+
+        Returns:
+            HxWx4 uint8 array
         """
-        Applies text overlays based on metadata and style options.
+        key = (text, font, color, font_size, max_width)
+        if key in self._caption_cache:
+            return self._caption_cache[key]
+
+        import numpy as np
+        from PIL import Image, ImageDraw, ImageFont
+
+        pil_font = _get_font(font, font_size) or ImageFont.load_default(size=font_size)
+
+        # Keep the author's explicit line breaks and word-wrap within each one
+        lines: List[str] = []
+        for paragraph in text.splitlines():
+            wrapped: List[str] = []
+            for token in paragraph.split():
+                for word in _split_long_word(token, pil_font, max_width):
+                    candidate = f"{wrapped[-1]} {word}" if wrapped else word
+                    if wrapped and pil_font.getlength(candidate) <= max_width:
+                        wrapped[-1] = candidate
+                    else:
+                        wrapped.append(word)
+            lines += wrapped or ['']
+
+        ascent, descent = pil_font.getmetrics()
+        line_height = ascent + descent
+        image = Image.new('RGBA', (max_width, max(1, line_height * len(lines))), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        for i, line in enumerate(lines):
+            x = (max_width - pil_font.getlength(line)) / 2
+            draw.text((x, i * line_height), line, font=pil_font, fill=color)
+
+        array = np.asarray(image)
+        self._caption_cache[key] = array
+        return array
+
+    def _build_srt(self, video_duration: float) -> str:
         """
+        Formats the text overlays as timed SRT cues instead of burning them into the video.
+
+        Args:
+            video_duration: Total duration of the stitched video in seconds
+
+        Returns:
+            SRT document, or an empty string if there are no overlays
+        """
+        def timestamp(seconds: float) -> str:
+            millis = int(round(seconds * 1000))
+            hours, millis = divmod(millis, 3_600_000)
+            minutes, millis = divmod(millis, 60_000)
+            secs, millis = divmod(millis, 1000)
+            return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+        cues = []
+        for i, overlay in enumerate(self._extract_overlays_from_metadata(video_duration), 1):
+            end = overlay['start'] + overlay['duration']
+            cues.append(f"{i}\n{timestamp(overlay['start'])} --> {timestamp(end)}\n{overlay['text']}\n\n")
+
+        return ''.join(cues)
+
+    def _prepare_overlays(self, video_duration: float, work_dir: str) -> List[Dict[str, Any]]:
+        """
+        Rasterizes the text overlays to PNG files for compositing in the ffmpeg graph.
+
+        Args:
+            video_duration: Total duration of the stitched video in seconds
+            work_dir: Directory for the caption images
+
+        Returns:
+            List of overlays with 'image', 'start', 'duration' and 'y' (top edge in pixels)
+        """
+        from PIL import Image
+
         # Get overlays from metadata with auto-distributed timing
-        overlays_data = self._extract_overlays_from_metadata(base_clip.duration)
+        overlays_data = self._extract_overlays_from_metadata(video_duration)
         style = self.selected_style
 
         font = style.get('font', 'Arial')
         color = style.get('color', 'white')
         font_size = style.get('font_size', 70)
 
-        text_clips = [base_clip]
+        if _get_font(font, font_size) is None:
+            logger.warning(f"Font '{font}' could not be loaded. Using default font.")
 
-        for overlay in overlays_data:
+        # Limiting to 70% width for better padding on sides
+        safe_width = int(TARGET_WIDTH * 0.7)
+        overlays = []
+
+        for i, overlay in enumerate(overlays_data):
             text = overlay.get('text', '')
-            start = overlay.get('start', 0)
-            duration = overlay.get('duration', 2)
-
-            # Apply fixes for text cutoff issue:
-            # 1. Use max width with padding to prevent edge rendering glitches
-            # 2. Add newline hack to ensure descenders (g, y, p, q, j) aren't cropped
-            # Limiting to 70% width for better padding on sides
-            safe_width = int(base_clip.w * 0.7)
-            text_with_margin = text + " \n"
-
-            # Create TextClip
-            # Using method='caption' to wrap text if needed, or default
+
             try:
-                txt_clip = (TextClip(text=text_with_margin, font_size=font_size, color=color, font=font, size=(safe_width, None), method='caption')
-                            .with_position(('center', 800))
-                            .with_start(start)
-                            .with_duration(duration))
-                text_clips.append(txt_clip)
+                caption = self._render_caption(text, font, color, font_size, safe_width)
+                image_path = os.path.join(work_dir, f"caption_{i}.png")
+                Image.fromarray(caption).save(image_path)
             except Exception as e:
-                logger.warning(f"Failed to create TextClip for '{text}': {e}. Trying fallback font.")
-                # Fallback without font specification (uses default)
-                try:
-                    txt_clip = (TextClip(text=text_with_margin, font_size=font_size, color=color, size=(safe_width, None), method='caption')
-                                .with_position(('center', 800))
-                                .with_start(start)
-                                .with_duration(duration))
-                    text_clips.append(txt_clip)
-                except Exception as e2:
-                    logger.error(f"Failed to create TextClip fallback: {e2}")
-
-        return CompositeVideoClip(text_clips)
-
-    def process_pipeline(self, dry_run: bool = False, output_path: str = None) -> None:
-        """
-        Executes the video processing pipeline: stitching -> overlays -> rendering.
+                logger.error(f"Failed to render caption for '{text}': {e}")
+                continue
+
+            overlays.append({
+                'image': image_path,
+                'start': overlay.get('start', 0),
+                'duration': overlay.get('duration', 2),
+                'y': CAPTION_Y,
+            })
+
+        return overlays
+
+    def process_pipeline(self, dry_run: bool = False, output_path: str = None, burn_in_captions: bool = True) -> None:
+        """
+        Executes the video processing pipeline: stitching -> audio -> overlays -> rendering.
         
         Args:
             dry_run (bool): If True, skips actual video rendering.
             output_path (str): Custom output path for the final video (optional)
+            burn_in_captions (bool): If False, captions are written to an .srt sidecar
+                next to the video and muxed as a soft subtitle track instead of being drawn.
         """
         scenes = self.instructions.get('scenes', [])
         logger.info(f"Processing {len(scenes)} scenes for 9:16 vertical render.")
@@ -346,31 +517,69 @@ class DanceShortsAutomator:
         logger.info(f"Using style: {self.selected_style.get('style', 'Unknown')}")
         
         if dry_run:
+            logger.info(f"[DRY-RUN] Planned timeline: {self.timeline_duration:.2f}s")
+            for overlay in self._extract_overlays_from_metadata(self.timeline_duration):
+                logger.info(f"[DRY-RUN] Overlay '{overlay['text']}' at {overlay['start']:.2f}s for {overlay['duration']:.2f}s")
             logger.info("[DRY-RUN] Video processing simulated. No file written.")
             return
 
+        if self.use_gpu and not nvenc_available():
+            logger.warning("DS_USE_NVENC is set but h264_nvenc is unavailable. Falling back to libx264.")
+            self.use_gpu = False
+
+        # Write video file (NVENC offloads the encode to the GPU when enabled)
+        if self.use_gpu:
+            encode_args = ['-c:v', 'h264_nvenc', '-preset', 'p4'] + NVENC_FFMPEG_PARAMS
+        else:
+            encode_args = ['-c:v', 'libx264', '-preset', 'medium']
+
         try:
-            logger.info("Step 1: Stitching Scenes...")
-            stitched_clip = self._stitch_scenes()
-
-            logger.info("Step 2: Applying Custom Audio (if specified)...")
-            stitched_clip = self._apply_custom_audio(stitched_clip)
-
-            logger.info(f"Step 3: Applying Text Overlays using style: {self.selected_style}...")
-            final_clip = self._apply_overlays(stitched_clip)
-
-            output_filename = output_path or "final_dance_short.mp4"
-            logger.info(f"Rendering final export to {output_filename}...")
-
-            # Write video file
-            final_clip.write_videofile(
-                output_filename,
-                fps=24,
-                codec='libx264',
-                audio_codec='aac',
-                threads=4
-            )
-            logger.info(f"✓ Render complete: {output_filename}")
+            with tempfile.TemporaryDirectory(prefix='danceshorts_') as work_dir:
+                stitcher = SceneStitcher(fps=OUTPUT_FPS, crossfade=CROSSFADE_DURATION, use_gpu=self.use_gpu)
+
+                logger.info("Step 1: Planning Scenes...")
+                segments = self._plan_segments(stitcher)
+                video_duration = stitcher.timeline_duration(segments)
+
+                logger.info("Step 2: Resolving Custom Audio (if specified)...")
+                audio_path = self._resolve_custom_audio(video_duration)
+
+                output_filename = output_path or "final_dance_short.mp4"
+                sidecar_path = os.path.splitext(output_filename)[0] + '.srt'
+                overlays, subtitles_path = [], None
+
+                if burn_in_captions:
+                    logger.info(f"Step 3: Rasterizing Text Overlays using style: {self.selected_style}...")
+                    overlays = self._prepare_overlays(video_duration, work_dir)
+                else:
+                    logger.info("Step 3: Writing Text Overlays as subtitles...")
+                    srt = self._build_srt(video_duration)
+                    if srt:
+                        # Staged in the work dir; published next to the video only after a successful render
+                        subtitles_path = os.path.join(work_dir, 'captions.srt')
+                        with open(subtitles_path, 'w', encoding='utf-8') as f:
+                            f.write(srt)
+
+                logger.info(f"Rendering final export to {output_filename}...")
+
+                # Stitch, captions, audio and encode all run in a single ffmpeg pass
+                stitcher.stitch(
+                    segments,
+                    output_filename,
+                    overlays=overlays,
+                    audio_path=audio_path,
+                    encode_args=encode_args + SHORTS_FFMPEG_PARAMS,
+                    subtitles_path=subtitles_path
+                )
+
+                if subtitles_path:
+                    shutil.copyfile(subtitles_path, sidecar_path)
+                    logger.info(f"Wrote caption sidecar to {sidecar_path}")
+                elif os.path.exists(sidecar_path):
+                    # A sidecar from an earlier --no-burn-in render no longer matches this video
+                    os.remove(sidecar_path)
+                    logger.info(f"Removed stale caption sidecar {sidecar_path}")
+                logger.info(f"✓ Render complete: {output_filename}")
 
         except Exception as e:
             logger.error(f"Pipeline failed: {e}")
@@ -0,0 +1,360 @@
+import os
+import logging
+import functools
+import subprocess
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TARGET_WIDTH, TARGET_HEIGHT = 720, 1280
+AUDIO_RATE = 44100
+
+# Largest gap (seconds) between consecutive cuts of one source that is decoded
+# through rather than re-seeked; roughly one GOP of typical camera/Veo footage
+MERGE_GAP = 2.0
+
+@functools.lru_cache(maxsize=1)
+def nvenc_available() -> bool:
+    """
+    Checks once per process whether ffmpeg can encode with h264_nvenc.
+
+    A listed encoder is not enough (the build may lack a GPU or driver),
+    so this runs a tiny test encode.
+    """
+    from moviepy.config import FFMPEG_BINARY
+
+    cmd = [FFMPEG_BINARY, '-loglevel', 'error', '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+           '-c:v', 'h264_nvenc', '-f', 'null', '-']
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=30).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+def probe_source(path: str) -> Dict[str, Any]:
+    """
+    Reads the duration, display size and audio presence of a source clip.
+
+    Probes are cached per file version (path, mtime, size), so scenes that
+    reuse a source spawn ffmpeg only once.
+
+    Args:
+        path: Path to the source video
+
+    Returns:
+        Dictionary with 'duration', 'width', 'height' and 'has_audio'
+    """
+    stat = os.stat(path)
+    return dict(_probe_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+
+@functools.lru_cache(maxsize=64)
+def _probe_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Uncached probe behind probe_source(); mtime_ns and size only key the cache.
+    """
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    infos = ffmpeg_parse_infos(path)
+    width, height = infos['video_size']
+
+    # ffmpeg auto-rotates on decode, so report the displayed orientation
+    if infos.get('video_rotation') in (90, 270, -90, -270):
+        width, height = height, width
+
+    return {
+        'duration': infos['duration'],
+        'width': width,
+        'height': height,
+        'has_audio': infos.get('audio_found', False),
+    }
+
+class SceneStitcher:
+    """
+    Stitches scenes into a single 9:16 clip with one ffmpeg invocation.
+
+    Every scene is trimmed at the demuxer, scaled and cropped to 720x1280,
+    and joined to the previous one with an xfade/acrossfade filter. Caption
+    images and a replacement audio track can be composited in the same graph,
+    so the whole render runs inside libavfilter instead of MoviePy's per-frame
+    Python compositor.
+    """
+
+    def __init__(self, fps: int = 24, crossfade: float = 0.5, use_gpu: bool = False):
+        """
+        Initialize the stitcher.
+
+        Args:
+            fps (int): Frame rate of the stitched output
+            crossfade (float): Cross-dissolve duration between scenes in seconds
+            use_gpu (bool): Decode with NVDEC and encode with h264_nvenc instead of libx264
+        """
+        self.fps = fps
+        self.crossfade = crossfade
+        self.use_gpu = use_gpu
+
+    def _normalize_filter(self) -> str:
+        """
+        Builds the scale + crop chain that fills the 9:16 frame (Crop-to-Fill).
+
+        force_original_aspect_ratio=increase lets the scaler pick the matching
+        axis itself, so the chain is identical for every source and the scaled
+        frame feeds the crop window directly.
+        """
+        return (
+            f"scale={TARGET_WIDTH}:{TARGET_HEIGHT}:force_original_aspect_ratio=increase,"
+            f"crop={TARGET_WIDTH}:{TARGET_HEIGHT},setsar=1"
+        )
+
+    def _group_inputs(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merges runs of consecutive segments cut from the same source into one input.
+
+        A segment joins the previous input when it comes from the same file and
+        starts at most MERGE_GAP seconds after the previous segment ends. The
+        shared range is then demuxed and decoded once and split in the graph,
+        rather than seeking again and re-decoding the GOP that straddles the cut.
+
+        Returns:
+            List of inputs with 'path', 'start', 'duration' and 'members' (segment indices)
+        """
+        inputs = []
+        for i, segment in enumerate(segments):
+            if inputs and inputs[-1]['path'] == segment['path']:
+                current = inputs[-1]
+                gap = segment['start'] - (current['start'] + current['duration'])
+                if 0 <= gap <= MERGE_GAP:
+                    current['duration'] = segment['start'] + segment['duration'] - current['start']
+                    current['members'].append(i)
+                    continue
+
+            inputs.append({
+                'path': segment['path'],
+                'start': segment['start'],
+                'duration': segment['duration'],
+                'members': [i],
+            })
+        return inputs
+
+    def _split_chains(self, head: str, source: Dict[str, Any], segments: List[Dict[str, Any]],
+                      audio: bool = False) -> List[str]:
+        """
+        Routes one decoded input stream to its per-segment labels ([v<i>] or [a<i>]).
+
+        A single-segment input is already trimmed at the demuxer; a merged one
+        is split and each branch trimmed to its own range.
+        """
+        a = 'a' if audio else ''
+        label = 'a' if audio else 'v'
+        # xfade needs a constant frame rate, which setpts discards, so fps goes last
+        tail = '' if audio else f",fps={self.fps},format=yuv420p"
+        members = source['members']
+        if len(members) == 1:
+            return [f"{head}{tail}[{label}{members[0]}]"]
+
+        chains = [f"{head},{a}split={len(members)}" + ''.join(f"[s{label}{i}]" for i in members)]
+        for i in members:
+            offset = segments[i]['start'] - source['start']
+            chains.append(
+                f"[s{label}{i}]{a}trim=start={offset:.3f}:duration={segments[i]['duration']:.3f},"
+                f"{a}setpts=PTS-STARTPTS{tail}[{label}{i}]"
+            )
+        return chains
+
+    def timeline_duration(self, segments: List[Dict[str, Any]]) -> float:
+        """
+        Returns the stitched length: every transition overlaps two segments by one crossfade.
+        """
+        if not segments:
+            return 0.0
+        return sum(segment['duration'] for segment in segments) - self.crossfade * (len(segments) - 1)
+
+    def build_filter_graph(self, segments: List[Dict[str, Any]], overlays: Optional[List[Dict[str, Any]]] = None,
+                           custom_audio: bool = False) -> List[str]:
+        """
+        Builds the filter_complex chains for the given segments.
+
+        The final video is labelled [vout]; [aout] is present only if a custom
+        audio track is used or at least one segment carries audio (silent
+        segments are padded with anullsrc).
+
+        Input order matches build_command: one input per grouped source, then
+        the custom audio track (if any), then one still image per overlay.
+
+        Args:
+            segments: Planned segments with 'duration', 'width', 'height', 'has_audio'
+            overlays: Caption images with 'image', 'start', 'duration' and 'y' (top edge)
+            custom_audio: Replace the scenes' audio with the track following the scene inputs
+
+        Returns:
+            List of filter chains, to be joined with ';'
+        """
+        with_audio = not custom_audio and any(segment['has_audio'] for segment in segments)
+        sources = self._group_inputs(segments)
+        chains = []
+
+        for j, source in enumerate(sources):
+            members = source['members']
+            chains += self._split_chains(f"[{j}:v]setpts=PTS-STARTPTS,{self._normalize_filter()}", source, segments)
+            if not with_audio:
+                continue
+            if segments[members[0]]['has_audio']:
+                chains += self._split_chains(
+                    f"[{j}:a]aformat=sample_rates={AUDIO_RATE}:channel_layouts=stereo,asetpts=PTS-STARTPTS",
+                    source, segments, audio=True
+                )
+            else:
+                for i in members:
+                    chains.append(
+                        f"anullsrc=r={AUDIO_RATE}:cl=stereo,atrim=duration={segments[i]['duration']}[a{i}]"
+                    )
+
+        video_label, audio_label = "v0", "a0"
+        offset = 0.0
+        for i in range(1, len(segments)):
+            # Each transition starts crossfade seconds before the running end
+            offset += segments[i - 1]['duration'] - self.crossfade
+            chains.append(
+                f"[{video_label}][v{i}]xfade=transition=fade:duration={self.crossfade}:offset={offset:.3f}[x{i}]"
+            )
+            video_label = f"x{i}"
+            if with_audio:
+                chains.append(f"[{audio_label}][a{i}]acrossfade=d={self.crossfade}[ax{i}]")
+                audio_label = f"ax{i}"
+
+        # Captions are still images; overlay holds the last frame and enable gates the window
+        first_overlay = len(sources) + (1 if custom_audio else 0)
+        for k, overlay in enumerate(overlays or []):
+            end = overlay['start'] + overlay['duration']
+            chains.append(
+                f"[{video_label}][{first_overlay + k}:v]overlay=x=(W-w)/2:y={overlay['y']}"
+                f":enable='between(t,{overlay['start']:.3f},{end:.3f})'[o{k}]"
+            )
+            video_label = f"o{k}"
+
+        chains.append(f"[{video_label}]null[vout]")
+        if custom_audio:
+            chains.append(
+                f"[{len(sources)}:a]aformat=sample_rates={AUDIO_RATE}:channel_layouts=stereo,"
+                f"atrim=duration={self.timeline_duration(segments):.3f},asetpts=PTS-STARTPTS[aout]"
+            )
+        elif with_audio:
+            chains.append(f"[{audio_label}]anull[aout]")
+
+        return chains
+
+    def build_command(self, segments: List[Dict[str, Any]], output_path: str,
+                      overlays: Optional[List[Dict[str, Any]]] = None, audio_path: Optional[str] = None,
+                      encode_args: Optional[List[str]] = None, subtitles_path: Optional[str] = None) -> List[str]:
+        """
+        Builds the full ffmpeg command line for stitching the segments.
+
+        Args:
+            segments: Planned segments (see plan_segment)
+            output_path: Path of the stitched video to write
+            overlays: Caption images to composite (see build_filter_graph)
+            audio_path: Audio file replacing the scenes' audio, trimmed to the timeline
+            encode_args: Video encoder arguments; defaults to a fast, visually lossless encode
+            subtitles_path: SRT file muxed as a soft mov_text subtitle track
+
+        Returns:
+            ffmpeg argument list
+        """
+        from moviepy.config import FFMPEG_BINARY
+
+        cmd = [FFMPEG_BINARY, '-y', '-loglevel', 'error']
+        for source in self._group_inputs(segments):
+            if self.use_gpu:
+                # NVDEC decode; ffmpeg falls back to software for unsupported codecs
+                cmd += ['-hwaccel', 'cuda']
+            cmd += ['-ss', f"{source['start']:.3f}", '-t', f"{source['duration']:.3f}", '-i', source['path']]
+        if audio_path:
+            cmd += ['-i', audio_path]
+        for overlay in overlays or []:
+            cmd += ['-i', overlay['image']]
+        if subtitles_path:
+            cmd += ['-i', subtitles_path]
+
+        graph = self.build_filter_graph(segments, overlays, custom_audio=bool(audio_path))
+        cmd += ['-filter_complex', ';'.join(graph), '-map', '[vout]']
+        if audio_path or any(segment['has_audio'] for segment in segments):
+            cmd += ['-map', '[aout]', '-c:a', 'aac', '-b:a', '192k']
+        else:
+            cmd += ['-an']
+        if subtitles_path:
+            # Subtitles are the last input; they bypass the filter graph
+            subtitle_input = len(self._group_inputs(segments)) + (1 if audio_path else 0) + len(overlays or [])
+            cmd += ['-map', f"{subtitle_input}:s", '-c:s', 'mov_text']
+
+        if encode_args:
+            cmd += encode_args
+        elif self.use_gpu:
+            cmd += ['-c:v', 'h264_nvenc', '-preset', 'p4', '-rc', 'vbr', '-cq', '19']
+        else:
+            cmd += ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18']
+        cmd += ['-r', str(self.fps), output_path]
+        return cmd
+
+    def plan_segment(self, source_path: str, scene: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """
+        Probes a scene's source and resolves its trim range.
+
+        Raises:
+            ValueError: If the requested range runs past the end of the source
+        """
+        start = scene.get('start', 0)
+        duration = scene.get('duration', 5)
+        info = probe_source(source_path)
+
+        if start + duration > info['duration'] + 1e-3:
+            raise ValueError(
+                f"Scene {index+1} requests {start}s-{start + duration}s but {source_path} "
+                f"is only {info['duration']:.2f}s long."
+            )
+
+        return {
+            'path': source_path,
+            'start': start,
+            'duration': duration,
+            'width': info['width'],
+            'height': info['height'],
+            'has_audio': info['has_audio'],
+        }
+
+    def stitch(self, segments: List[Dict[str, Any]], output_path: str,
+               overlays: Optional[List[Dict[str, Any]]] = None, audio_path: Optional[str] = None,
+               encode_args: Optional[List[str]] = None, subtitles_path: Optional[str] = None) -> None:
+        """
+        Runs ffmpeg to write the stitched video (see build_command for the optional stages).
+
+        Raises:
+            ValueError: If there are no segments or one is shorter than the crossfade
+            RuntimeError: If ffmpeg fails
+        """
+        if not segments:
+            raise ValueError("No valid clips found to stitch.")
+
+        if len(segments) > 1:
+            for i, segment in enumerate(segments):
+                if segment['duration'] <= self.crossfade:
+                    raise ValueError(
+                        f"Segment {i+1} ({segment['duration']}s) must be longer than the "
+                        f"{self.crossfade}s crossfade."
+                    )
+
+        # Render beside the output and move it into place only on success, so an
+        # interrupted or failed run never leaves a truncated file under the final name
+        root, ext = os.path.splitext(output_path)
+        partial_path = f"{root}.partial{ext}"
+
+        cmd = self.build_command(segments, partial_path, overlays, audio_path, encode_args, subtitles_path)
+        logger.debug(f"Running: {' '.join(cmd)}")
+        try:
+            # ffmpeg echoes file names and metadata in stderr; never fail on undecodable bytes
+            result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace')
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg stitching failed: {result.stderr.strip()[-2000:]}")
+            os.replace(partial_path, output_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        logger.info(f"Stitched {len(segments)} scene(s) into {output_path}")
@@ -0,0 +1,18 @@
+import pytest
+import subprocess
+from moviepy.config import FFMPEG_BINARY
+
+def _make_clip(path, size, duration, with_audio):
+    """Renders a tiny synthetic clip with ffmpeg's lavfi sources."""
+    cmd = [FFMPEG_BINARY, '-y', '-loglevel', 'error',
+           '-f', 'lavfi', '-i', f"testsrc=size={size}:rate=24:duration={duration}"]
+    if with_audio:
+        cmd += ['-f', 'lavfi', '-i', f"sine=duration={duration}", '-c:a', 'aac']
+    cmd += ['-c:v', 'libx264', '-preset', 'ultrafast', str(path)]
+    subprocess.run(cmd, check=True)
+    return str(path)
+
+@pytest.fixture(scope="session")
+def make_clip():
+    """Provides the synthetic clip renderer to any test module."""
+    return _make_clip
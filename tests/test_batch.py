@@ -0,0 +1,138 @@
+import pytest
+import json
+import os
+from pathlib import Path
+import main
+
+METADATA = {"option_1": {"title": "T", "text_overlay": ["Feel the beat"]}, "recommended": 1}
+STYLE = {"options": {"1": {"style": "Basic"}}, "default": "1"}
+
+def _write_project(folder, scenes, metadata=METADATA):
+    """Writes a project folder with instructions and metadata (style comes from the master copy)."""
+    folder.mkdir(parents=True)
+    with open(folder / "veo_instructions.json", 'w') as f:
+        json.dump({"scenes": scenes}, f)
+    with open(folder / "metadata_options.json", 'w') as f:
+        json.dump(metadata, f)
+    return folder
+
+@pytest.fixture
+def batch_root(tmp_path):
+    """Creates inputs/ and outputs/ under tmp_path with a master style_options.json."""
+    with open(tmp_path / "style_options.json", 'w') as f:
+        json.dump(STYLE, f)
+    return tmp_path
+
+def test_parallel_batch_reports_every_project(batch_root, monkeypatch):
+    """Test that jobs=2 processes all projects and a failing one does not stop the batch."""
+    inputs = batch_root / "inputs"
+    for name in ("alpha", "beta"):
+        _write_project(inputs / name, [{"id": 1, "source": "clip.mp4", "duration": 2}])
+    _write_project(inputs / "broken", [{"id": 1, "duration": 2}])
+
+    summaries = []
+    monkeypatch.setattr(main, "_print_batch_summary", lambda results, *_: summaries.append(results))
+
+    with pytest.raises(SystemExit) as exc:
+        main.process_batch(str(inputs), str(batch_root / "outputs"), dry_run=True, jobs=2)
+
+    assert exc.value.code == 1
+    assert sorted(summaries[0]['succeeded']) == ["alpha", "beta"]
+    assert summaries[0]['failed'] == ["broken"]
+
+@pytest.fixture
+def footage_project(batch_root):
+    """A project whose scene source lives in a subfolder."""
+    project = _write_project(batch_root / "inputs" / "dance", [{"id": 1, "source": "footage/clip.mp4", "duration": 2}])
+    (project / "footage").mkdir()
+    (project / "footage" / "clip.mp4").write_bytes(b"not decoded by these tests")
+    (batch_root / "outputs").mkdir()
+    return project
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Replaces the render with a stub that records the caption mode and writes the output."""
+    calls = []
+
+    def fake_pipeline(self, dry_run=False, output_path=None, burn_in_captions=True):
+        calls.append(burn_in_captions)
+        Path(output_path).write_bytes(b"video")
+
+    monkeypatch.setattr(main.DanceShortsAutomator, "process_pipeline", fake_pipeline)
+    return calls
+
+def _run_incremental(batch_root, project, burn_in_captions=True):
+    return main._process_single_project(
+        project, batch_root / "style_options.json", batch_root / "outputs",
+        dry_run=False, burn_in_captions=burn_in_captions, incremental=True
+    )
+
+def test_incremental_renders_missing_output(batch_root, footage_project, renders):
+    """Test that a project without an output is rendered and its inputs recorded."""
+    assert _run_incremental(batch_root, footage_project)
+    assert renders == [True]
+    assert (batch_root / "outputs" / "dance_final.inputs.json").exists()
+
+def test_incremental_skips_up_to_date_output(batch_root, footage_project, renders):
+    """Test that an output whose recorded inputs are unchanged is not rendered again."""
+    assert _run_incremental(batch_root, footage_project)
+    assert _run_incremental(batch_root, footage_project)
+    assert renders == [True]
+
+def test_incremental_rerenders_after_source_change(batch_root, footage_project, renders):
+    """Test that a changed scene source triggers a new render even if its mtime goes back in time."""
+    assert _run_incremental(batch_root, footage_project)
+    os.utime(footage_project / "footage" / "clip.mp4", (1_000_000, 1_000_000))
+
+    assert _run_incremental(batch_root, footage_project)
+    assert renders == [True, True]
+
+def test_incremental_rerenders_when_missing_source_appears(batch_root, renders):
+    """Test that a source missing at render time and copied in later with an old mtime invalidates the render."""
+    project = _write_project(batch_root / "inputs" / "dance", [{"id": 1, "source": "late.mp4", "duration": 2}])
+    (batch_root / "outputs").mkdir()
+    assert _run_incremental(batch_root, project)
+
+    (project / "late.mp4").write_bytes(b"arrived later")
+    os.utime(project / "late.mp4", (1_000_000, 1_000_000))
+
+    assert _run_incremental(batch_root, project)
+    assert renders == [True, True]
+
+def test_incremental_rerenders_when_output_replaced(batch_root, footage_project, renders):
+    """Test that an output changed since its manifest was written is not trusted."""
+    assert _run_incremental(batch_root, footage_project)
+    (batch_root / "outputs" / "dance_final.mp4").write_bytes(b"truncated")
+
+    assert _run_incremental(batch_root, footage_project)
+    assert renders == [True, True]
+
+def test_incremental_rerenders_when_caption_mode_changes(batch_root, footage_project, renders):
+    """Test that a burned-in render is not reused for a --no-burn-in run."""
+    assert _run_incremental(batch_root, footage_project)
+    assert _run_incremental(batch_root, footage_project, burn_in_captions=False)
+    assert renders == [True, False]
+
+def test_failed_render_is_not_reused(batch_root, make_clip):
+    """Test that a failed render leaves no output, so the next incremental run tries again."""
+    project = batch_root / "inputs" / "dance"
+    project.mkdir(parents=True)
+    make_clip(project / "clip.mp4", "320x180", 2, with_audio=False)
+    with open(project / "veo_instructions.json", 'w') as f:
+        # A video-only file as the custom audio track makes ffmpeg fail mid-render
+        json.dump({"scenes": [{"id": 1, "source": "clip.mp4", "duration": 2}], "audio_source": "clip.mp4"}, f)
+    with open(project / "metadata_options.json", 'w') as f:
+        json.dump(METADATA, f)
+    (batch_root / "outputs").mkdir()
+
+    assert not _run_incremental(batch_root, project)
+    assert list((batch_root / "outputs").iterdir()) == []
+    assert not _run_incremental(batch_root, project)
+
+def test_discovery_keeps_dunder_named_projects(batch_root):
+    """Test that only hidden folders and __pycache__ are skipped, not projects like __intro."""
+    inputs = batch_root / "inputs"
+    for name in ("__intro", ".git", "__pycache__"):
+        _write_project(inputs / name, [{"id": 1, "source": "clip.mp4", "duration": 2}])
+
+    assert [p.name for p in main._discover_project_folders(inputs)] == ["__intro"]
@@ -3,9 +3,10 @@ import json
 import os
 from src.core.app import DanceShortsAutomator
 
-@pytest.fixture
-def mock_data_files(tmp_path):
-    """Creates temporary JSON files for testing."""
+@pytest.fixture(scope="session")
+def mock_data_files(tmp_path_factory):
+    """Creates temporary JSON files for testing, once per session (tests must not modify them)."""
+    tmp_path = tmp_path_factory.mktemp("config")
     instr_file = tmp_path / "veo_instructions.json"
     opts_file = tmp_path / "metadata_options.json"
     style_file = tmp_path / "style_options.json"
@@ -65,5 +66,150 @@ def test_dry_run_pipeline(mock_data_files, caplog):
     with caplog.at_level("INFO"):
         app.process_pipeline(dry_run=True)
     
-    assert "[DRY-RUN]" in caplog.text
-    assert "Recommended" in caplog.text
\ No newline at end of file
+    # caplog.text re-formats every record on each access, so read it once
+    log_text = caplog.text
+    assert "[DRY-RUN]" in log_text
+    assert "Recommended" in log_text
+
+def _write_instructions(tmp_path, scenes):
+    path = tmp_path / "veo_instructions.json"
+    with open(path, 'w') as f:
+        json.dump({"scenes": scenes}, f)
+    return str(path)
+
+def test_veo_generation_format_rejected_at_load(mock_data_files, tmp_path):
+    """Test that Veo generation scenes are rejected before any clip is decoded."""
+    _, opts, style = mock_data_files
+    instr = _write_instructions(tmp_path, [{"id": 1, "prompt": "A dancer spins", "start_image": "a.png"}])
+    app = DanceShortsAutomator(instr, opts, style)
+
+    with pytest.raises(ValueError, match="Veo AI generation format"):
+        app.load_configurations()
+
+def test_invalid_scene_duration_rejected(mock_data_files, tmp_path):
+    """Test that non-positive or non-numeric timings fail validation."""
+    _, opts, style = mock_data_files
+    for bad in (0, -1, "5"):
+        instr = _write_instructions(tmp_path, [{"id": 1, "source": "clip.mp4", "start": 0, "duration": bad}])
+        app = DanceShortsAutomator(instr, opts, style)
+        with pytest.raises(ValueError, match="Scene 1"):
+            app.load_configurations()
+
+def test_get_font_caches_missing_fonts():
+    """Test that unresolvable fonts are looked up once and reported as None."""
+    from src.core.app import _get_font
+    _get_font.cache_clear()
+
+    assert _get_font("definitely-not-a-font", 70) is None
+    assert _get_font("definitely-not-a-font", 70) is None
+    assert _get_font.cache_info().hits == 1
+
+def test_nvenc_opt_in_from_environment(mock_data_files, monkeypatch):
+    """Test that DS_USE_NVENC toggles GPU encoding."""
+    instr, opts, style = mock_data_files
+    monkeypatch.setenv("DS_USE_NVENC", "1")
+    assert DanceShortsAutomator(instr, opts, style).use_gpu
+
+    monkeypatch.delenv("DS_USE_NVENC")
+    assert not DanceShortsAutomator(instr, opts, style).use_gpu
+
+def test_load_configurations_without_orjson(mock_data_files, monkeypatch):
+    """Test that the stdlib json fallback loads the same configuration."""
+    import src.core.app as app_module
+    monkeypatch.setattr(app_module, "orjson", None)
+
+    instr, opts, style = mock_data_files
+    app = DanceShortsAutomator(instr, opts, style)
+    app.load_configurations()
+
+    assert app.selected_metadata['title'] == "Test Option 2"
+
+def test_timeline_computed_at_load(mock_data_files, tmp_path):
+    """Test that scene start times account for the crossfade overlap and ignore scene ids."""
+    _, opts, style = mock_data_files
+    # Ids are free-form labels: repeated, fractional or missing ids still load
+    instr = _write_instructions(tmp_path, [
+        {"source": "a.mp4", "duration": 2},
+        {"id": 1, "source": "b.mp4", "duration": 4},
+        {"id": 1.5, "source": "c.mp4", "duration": 3},
+    ])
+    app = DanceShortsAutomator(instr, opts, style)
+    app.load_configurations()
+
+    assert app.scene_start_times == [0.0, 1.5, 5.0]
+    assert app.timeline_duration == pytest.approx(8.0)
+
+def test_captions_rasterized_once(mock_data_files):
+    """Test that captions are wrapped to the safe width and cached per text and style."""
+    instr, opts, style = mock_data_files
+    app = DanceShortsAutomator(instr, opts, style)
+
+    caption = app._render_caption("Feel the beat drop tonight", "definitely-not-a-font", "white", 70, 300)
+    assert caption.shape[1] == 300 and caption.shape[2] == 4
+    assert caption[..., 3].max() == 255
+    assert app._render_caption("Feel the beat drop tonight", "definitely-not-a-font", "white", 70, 300) is caption
+
+def test_caption_keeps_explicit_line_breaks(mock_data_files):
+    """Test that newlines in a caption start a new line even when the text would fit."""
+    instr, opts, style = mock_data_files
+    app = DanceShortsAutomator(instr, opts, style)
+
+    one_line = app._render_caption("Feel it", "definitely-not-a-font", "white", 40, 600)
+    two_lines = app._render_caption("Feel\nit", "definitely-not-a-font", "white", 40, 600)
+    assert two_lines.shape[0] == 2 * one_line.shape[0]
+
+def test_caption_breaks_words_wider_than_the_box(mock_data_files):
+    """Test that a single over-long word is broken across lines instead of clipped."""
+    from PIL import ImageFont
+    from src.core.app import _split_long_word
+    instr, opts, style = mock_data_files
+    app = DanceShortsAutomator(instr, opts, style)
+
+    font = ImageFont.load_default(size=40)
+    pieces = _split_long_word("Supercalifragilistic", font, 120)
+    assert "".join(pieces) == "Supercalifragilistic" and len(pieces) > 1
+    assert all(font.getlength(piece) <= 120 for piece in pieces)
+
+    one_line = app._render_caption("Feel", "definitely-not-a-font", "white", 40, 120)
+    broken = app._render_caption("Supercalifragilistic", "definitely-not-a-font", "white", 40, 120)
+    assert broken.shape[:2] == (len(pieces) * one_line.shape[0], 120)
+
+def test_srt_sidecar_built_from_overlays(mock_data_files, tmp_path):
+    """Test that overlays become SRT cues with the auto-distributed timing."""
+    instr, _, style = mock_data_files
+    opts = str(tmp_path / "metadata_options.json")
+    with open(opts, 'w') as f:
+        json.dump({"option_1": {"title": "T", "text_overlay": ["Feel the beat", "Dance"]}, "recommended": 1}, f)
+    app = DanceShortsAutomator(instr, opts, style)
+    app.load_configurations()
+
+    assert app._build_srt(6.0) == (
+        "1\n00:00:00,000 --> 00:00:02,500\nFeel the beat\n\n"
+        "2\n00:00:03,000 --> 00:00:05,500\nDance\n\n"
+    )
+
+def test_srt_sidecar_published_only_after_render(mock_data_files, tmp_path, monkeypatch):
+    """Test that a failed render leaves no orphan .srt and a successful one publishes it."""
+    from src.core.stitcher import SceneStitcher
+    instr, _, style = mock_data_files
+    opts = str(tmp_path / "metadata_options.json")
+    with open(opts, 'w') as f:
+        json.dump({"option_1": {"title": "T", "text_overlay": ["Feel the beat"]}, "recommended": 1}, f)
+    app = DanceShortsAutomator(instr, opts, style)
+    app.load_configurations()
+
+    segments = [{'path': 'a.mp4', 'start': 0, 'duration': 4, 'width': 720, 'height': 1280, 'has_audio': False}]
+    monkeypatch.setattr(app, "_plan_segments", lambda stitcher: segments)
+    output = tmp_path / "short.mp4"
+
+    def failing_stitch(self, *args, **kwargs):
+        raise RuntimeError("ffmpeg stitching failed")
+
+    monkeypatch.setattr(SceneStitcher, "stitch", failing_stitch)
+    with pytest.raises(RuntimeError):
+        app.process_pipeline(output_path=str(output), burn_in_captions=False)
+    assert not (tmp_path / "short.srt").exists()
+
+    monkeypatch.setattr(SceneStitcher, "stitch", lambda self, *args, **kwargs: None)
+    app.process_pipeline(output_path=str(output), burn_in_captions=False)
+    assert "Feel the beat" in (tmp_path / "short.srt").read_text()
@@ -0,0 +1,140 @@
+import pytest
+from src.core.stitcher import SceneStitcher, probe_source
+
+def _segment(path, duration, width=1920, height=1080, has_audio=True, start=0):
+    return {'path': path, 'start': start, 'duration': duration,
+            'width': width, 'height': height, 'has_audio': has_audio}
+
+@pytest.fixture(scope="module")
+def source_clips(tmp_path_factory, make_clip):
+    """Renders one wide (with audio) and one tall (silent) 2s source, shared by the module."""
+    tmp_path = tmp_path_factory.mktemp("sources")
+    wide = make_clip(tmp_path / "wide.mp4", "320x180", 2, with_audio=True)
+    tall = make_clip(tmp_path / "tall.mp4", "180x320", 2, with_audio=False)
+    return wide, tall
+
+def test_xfade_offsets_follow_running_length():
+    """Test that each transition starts crossfade seconds before the running end."""
+    stitcher = SceneStitcher(crossfade=0.5)
+    graph = ';'.join(stitcher.build_filter_graph([
+        _segment('a.mp4', 2), _segment('b.mp4', 4), _segment('c.mp4', 3)
+    ]))
+
+    assert "xfade=transition=fade:duration=0.5:offset=1.500[x1]" in graph
+    assert "xfade=transition=fade:duration=0.5:offset=5.000[x2]" in graph
+    assert graph.count("acrossfade") == 2
+
+def test_crop_to_fill_is_a_single_scale_crop_chain():
+    """Test that wide and tall sources share one fused scale+crop chain."""
+    graph = ';'.join(SceneStitcher().build_filter_graph([
+        _segment('w.mp4', 2), _segment('t.mp4', 2, 1080, 1920)
+    ]))
+    chain = "scale=720:1280:force_original_aspect_ratio=increase,crop=720:1280,setsar=1"
+    assert graph.count(chain) == 2
+    assert graph.count("scale=") == 2
+
+def test_silent_sources_are_padded_or_dropped():
+    """Test audio handling when some or all sources are silent."""
+    stitcher = SceneStitcher()
+    mixed = ';'.join(stitcher.build_filter_graph([_segment('a.mp4', 2), _segment('b.mp4', 2, has_audio=False)]))
+    assert "anullsrc" in mixed and "[aout]" in mixed
+
+    silent = [_segment('a.mp4', 2, has_audio=False)]
+    assert "[aout]" not in ';'.join(stitcher.build_filter_graph(silent))
+    assert '-an' in stitcher.build_command(silent, 'out.mp4')
+
+def test_stitch_renders_vertical_clip(source_clips, tmp_path):
+    """Test a real stitch of two cuts of a wide (with audio) and a tall (silent) source."""
+    wide, tall = source_clips
+    stitcher = SceneStitcher()
+    segments = [
+        stitcher.plan_segment(wide, {"source": wide, "start": 0, "duration": 0.9}, 0),
+        stitcher.plan_segment(wide, {"source": wide, "start": 1.0, "duration": 1.0}, 1),
+        stitcher.plan_segment(tall, {"source": tall, "start": 0, "duration": 1.5}, 2),
+    ]
+
+    output = str(tmp_path / "stitched.mp4")
+    stitcher.stitch(segments, output)
+
+    info = probe_source(output)
+    assert (info['width'], info['height']) == (720, 1280)
+    assert info['duration'] == pytest.approx(2.4, abs=0.1)
+    assert info['has_audio']
+
+def test_range_past_end_of_source_rejected(source_clips):
+    """Test that a scene running past the end of its source fails clearly."""
+    clip, _ = source_clips
+    with pytest.raises(ValueError, match="Scene 1"):
+        SceneStitcher().plan_segment(clip, {"source": clip, "start": 0.5, "duration": 2}, 0)
+
+def test_gpu_stitch_uses_nvdec_and_nvenc():
+    """Test that the GPU path decodes with CUDA and encodes with h264_nvenc."""
+    segments = [_segment('a.mp4', 2), _segment('b.mp4', 2)]
+    gpu_cmd = SceneStitcher(use_gpu=True).build_command(segments, 'out.mp4')
+    assert 'h264_nvenc' in gpu_cmd
+    assert gpu_cmd.count('-hwaccel') == 2
+
+    cpu_cmd = SceneStitcher().build_command(segments, 'out.mp4')
+    assert 'libx264' in cpu_cmd and '-hwaccel' not in cpu_cmd
+
+def test_consecutive_cuts_of_one_source_share_an_input():
+    """Test that back-to-back cuts of a source are decoded once and split."""
+    stitcher = SceneStitcher()
+    segments = [
+        _segment('a.mp4', 2, start=0),
+        _segment('a.mp4', 2, start=3),    # 1s gap: decoded through
+        _segment('a.mp4', 2, start=20),   # far away: seeks again
+    ]
+
+    cmd = stitcher.build_command(segments, 'out.mp4')
+    graph = ';'.join(stitcher.build_filter_graph(segments))
+
+    assert cmd.count('-i') == 2
+    assert cmd[cmd.index('-i') - 3:cmd.index('-i')] == ['0.000', '-t', '5.000']
+    assert "split=2[sv0][sv1]" in graph and "asplit=2[sa0][sa1]" in graph
+    assert "[sv1]trim=start=3.000:duration=2.000,setpts=PTS-STARTPTS,fps=24,format=yuv420p[v1]" in graph
+    assert "[1:v]" in graph and "[2:v]" not in graph
+
+def test_probe_cached_per_file_version(tmp_path, make_clip):
+    """Test that repeated probes of one source reuse the cache until it changes."""
+    from src.core.stitcher import _probe_file
+    clip = make_clip(tmp_path / "clip.mp4", "320x180", 1, with_audio=False)
+    _probe_file.cache_clear()
+
+    probe_source(clip)
+    probe_source(clip)
+    assert _probe_file.cache_info().hits == 1
+
+    make_clip(tmp_path / "clip.mp4", "180x320", 2, with_audio=False)
+    assert (probe_source(clip)['width'], probe_source(clip)['height']) == (180, 320)
+
+def test_overlays_and_custom_audio_join_the_graph():
+    """Test that captions are gated overlays and custom audio replaces scene audio."""
+    stitcher = SceneStitcher()
+    segments = [_segment('a.mp4', 2), _segment('b.mp4', 3)]
+    overlays = [{'image': 'cap0.png', 'start': 0, 'duration': 2.5, 'y': 800}]
+
+    cmd = stitcher.build_command(segments, 'out.mp4', overlays=overlays, audio_path='song.mp3')
+    graph = cmd[cmd.index('-filter_complex') + 1]
+
+    assert cmd[cmd.index('song.mp3') + 2] == 'cap0.png'
+    assert "[x1][3:v]overlay=x=(W-w)/2:y=800:enable='between(t,0.000,2.500)'[o0]" in graph
+    assert "[2:a]aformat=sample_rates=44100:channel_layouts=stereo,atrim=duration=4.500" in graph
+    assert "acrossfade" not in graph
+
+def test_subtitles_muxed_as_soft_track():
+    """Test that an SRT sidecar is mapped as a mov_text stream after the other inputs."""
+    cmd = SceneStitcher().build_command([_segment('a.mp4', 2)], 'out.mp4', subtitles_path='out.srt')
+    assert cmd.count('-i') == 2 and cmd[cmd.index('out.srt') - 1] == '-i'
+    assert "-map 1:s -c:s mov_text" in ' '.join(cmd)
+
+def test_failed_stitch_leaves_output_untouched(tmp_path):
+    """Test that a failed render neither truncates the previous output nor leaves a partial file."""
+    output = tmp_path / "out.mp4"
+    output.write_bytes(b"previous render")
+
+    with pytest.raises(RuntimeError):
+        SceneStitcher().stitch([_segment(str(tmp_path / "missing.mp4"), 2)], str(output))
+
+    assert output.read_bytes() == b"previous render"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.mp4"]